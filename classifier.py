@@ -0,0 +1,165 @@
+import json
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Правила по умолчанию: порядок категорий задает приоритет
+DEFAULT_RULES: List[Tuple[str, List[str]]] = [
+    ("income", ['входящий', 'поступление', 'зачисление', 'перевод на счет']),
+    ("payment", ['платеж', 'оплата', 'списание', 'покупка']),
+    ("transfer", ['перевод', 'перечисление', 'внутрибанковский']),
+    ("withdrawal", ['снятие', 'выдача', 'банкомат']),
+    ("fee", ['комиссия', 'плата за']),
+]
+
+DEFAULT_CATEGORY = "other"
+UNKNOWN_CATEGORY = "unknown"
+
+# Файл с правилами по банкам (необязательный)
+RULES_FILE = Path(__file__).parent / "classification_rules.json"
+
+
+class TransactionClassifier:
+    """Классификатор транзакций по ключевым словам.
+
+    Таблица правил компилируется в автомат Ахо-Корасик, поэтому описание
+    просматривается за один проход независимо от числа категорий и слов.
+    Результаты кэшируются по исходной строке описания.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Iterable[str]]] = DEFAULT_RULES,
+                 default: str = DEFAULT_CATEGORY, cache_size: int = 4096):
+        self.categories = [name for name, _ in rules]
+        self.default = default
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Для каждого состояния - лучший (минимальный) приоритет найденного слова
+        self._out: List[Optional[int]] = [None]
+        self._compile(rules)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _compile(self, rules: Sequence[Tuple[str, Iterable[str]]]):
+        """Построение автомата по таблице правил"""
+        for priority, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                state = 0
+                for char in keyword:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append(None)
+                    state = next_state
+                if self._out[state] is None or priority < self._out[state]:
+                    self._out[state] = priority
+
+        # Суффиксные ссылки строим обходом в ширину
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                inherited = self._out[fail]
+                if inherited is not None and (self._out[next_state] is None or inherited < self._out[next_state]):
+                    self._out[next_state] = inherited
+
+    def _classify(self, description: str) -> str:
+        """Классификация одного описания"""
+        if not description:
+            return UNKNOWN_CATEGORY
+
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        state = 0
+        for char in description.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = out[state]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+                if best == 0:
+                    break
+
+        return self.categories[best] if best is not None else self.default
+
+    def classify_batch(self, descriptions: Iterable[str]) -> List[str]:
+        """Классификация столбца описаний (повторы берутся из кэша)"""
+        return [self.classify(description) for description in descriptions]
+
+    @classmethod
+    def from_file(cls, path: str, bank_name: Optional[str] = None) -> "TransactionClassifier":
+        """Загрузка правил из JSON-файла"""
+        tables = load_rules(path)
+        rules, default = tables.get(bank_name) or tables["default"]
+        return cls(rules, default=default)
+
+
+def _parse_rule_table(table: Dict) -> Tuple[List[Tuple[str, List[str]]], str]:
+    """Разбор таблицы правил из JSON"""
+    rules = [(rule["category"], list(rule["keywords"])) for rule in table.get("rules", [])]
+    return rules, table.get("default", DEFAULT_CATEGORY)
+
+
+def load_rules(path: str) -> Dict[Optional[str], Tuple[List[Tuple[str, List[str]]], str]]:
+    """Чтение правил классификации по банкам.
+
+    Формат файла::
+
+        {
+            "default": {"rules": [{"category": "income", "keywords": ["зачисление"]}]},
+            "banks": {"ТБанк": {"rules": [...], "default": "other"}}
+        }
+
+    Порядок правил задает приоритет категорий.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    tables = {"default": (list(DEFAULT_RULES), DEFAULT_CATEGORY)}
+    if "default" in data:
+        tables["default"] = _parse_rule_table(data["default"])
+    for bank_name, table in data.get("banks", {}).items():
+        tables[bank_name] = _parse_rule_table(table)
+    return tables
+
+
+_rule_tables: Optional[Dict[Optional[str], Tuple[List[Tuple[str, List[str]]], str]]] = None
+_classifiers: Dict[str, TransactionClassifier] = {}
+
+
+def _get_rule_tables() -> Dict[Optional[str], Tuple[List[Tuple[str, List[str]]], str]]:
+    """Правила из RULES_FILE (читаются один раз)"""
+    global _rule_tables
+    if _rule_tables is None:
+        _rule_tables = {"default": (list(DEFAULT_RULES), DEFAULT_CATEGORY)}
+        if RULES_FILE.exists():
+            try:
+                _rule_tables = load_rules(str(RULES_FILE))
+            except Exception as e:
+                print(f"Ошибка загрузки правил классификации: {e}")
+    return _rule_tables
+
+
+def get_classifier(bank_name: Optional[str] = None) -> TransactionClassifier:
+    """Классификатор для банка.
+
+    Банки, которых нет в RULES_FILE, получают общий классификатор по умолчанию.
+    """
+    tables = _get_rule_tables()
+    key = bank_name if bank_name in tables else "default"
+    if key not in _classifiers:
+        rules, default = tables[key]
+        _classifiers[key] = TransactionClassifier(rules, default=default)
+    return _classifiers[key]
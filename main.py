@@ -1,11 +1,13 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Query
+from fastapi.responses import Response
 import os
 import shutil
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 import json
 from parser import BankStatementParser
+from utils import MAX_PAGE_NUMBER, parse_period_date, parse_page_range
+from serialization import RESPONSE_FORMATS, dumps, to_compact, compress
 from datetime import datetime
 
 app = FastAPI()
@@ -15,7 +17,32 @@ UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 @app.post("/parser/parse-bank-statement/")
-async def parse_bank_statement(file: UploadFile = File(...)):
+async def parse_bank_statement(
+    file: UploadFile = File(...),
+    format: str = Query("full"),
+    pages: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    # Проверяем формат ответа
+    if format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(RESPONSE_FORMATS)}")
+
+    # Проверяем диапазон страниц и период
+    try:
+        page_list = parse_page_range(pages)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Pages must look like 1,3,5-7 and not exceed {MAX_PAGE_NUMBER}")
+    period = {}
+    for name, value in (("date_from", date_from), ("date_to", date_to)):
+        if value:
+            period[name] = parse_period_date(value)
+            if not period[name]:
+                raise HTTPException(status_code=400, detail=f"Invalid {name}: {value}")
+    if "date_from" in period and "date_to" in period and period["date_from"] > period["date_to"]:
+        raise HTTPException(status_code=400, detail="date_from must not be later than date_to")
+
     try:
         # Проверяем, что файл является PDF
         if not file.filename.lower().endswith('.pdf'):
@@ -40,17 +67,32 @@ async def parse_bank_statement(file: UploadFile = File(...)):
 
         # Создаем парсер и обрабатываем файл
         parser = BankStatementParser(str(file_path))
-        result = parser.parse()
+        result = parser.parse(page_list, **period)
 
         # Удаляем временный файл
         file_path.unlink()
         print(f"Временный файл {file_path} удален")
 
-        # Возвращаем результат
-        return JSONResponse(content={
+        if format == "compact":
+            result = to_compact(result)
+
+        # Сериализуем и сжимаем результат
+        body = dumps({
             "status": "success",
             "data": result
         })
+        content, encoding = compress(body, accept_encoding)
+        print(f"Размер ответа: {len(body)} байт, после сжатия ({encoding or 'identity'}): {len(content)} байт")
+
+        headers = {
+            "Vary": "Accept-Encoding",
+            "X-Uncompressed-Length": str(len(body))
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        # Возвращаем результат
+        return Response(content=content, media_type="application/json", headers=headers)
 
     except Exception as e:
         # Если произошла ошибка, удаляем файл (если он был создан)
@@ -1,9 +1,10 @@
 import json
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from text_extractor import TextExtractor
 from table_parser import TableParser
 from regex_parser import RegexParser
+from classifier import get_classifier
 
 class BankStatementParser:
     def __init__(self, pdf_file: str):
@@ -13,17 +14,47 @@ class BankStatementParser:
         self.regex_parser = RegexParser(pdf_file)
         self.rejected_rows = []  # Список для хранения отклоненных строк
 
-    def parse(self) -> Dict:
-        """Основной метод парсинга"""
+    def parse(self, pages: Optional[List[int]] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict:
+        """Основной метод парсинга.
+
+        pages - номера страниц для обработки, date_from/date_to - период
+        транзакций в формате YYYY-MM-DD.
+        """
         print(f"Начинаем парсинг файла: {self.pdf_file}")
         
         bank_name = self.text_extractor.detect_bank()
         account_info = self.text_extractor.extract_account_info()
         
+        # Правила классификации зависят от банка
+        classifier = get_classifier(bank_name)
+        self.table_parser.classifier = classifier
+        self.regex_parser.classifier = classifier
+        
         # Получаем транзакции
-        transactions = self.table_parser.extract_tables_universal()
+        transactions = self.table_parser.extract_tables_universal(pages, date_from, date_to)
         if not transactions:
-            transactions = self.regex_parser.extract_with_regex()
+            if self.table_parser.skipped_pages:
+                # Часть страниц вне периода: регулярки читают только оставшиеся
+                if self.table_parser.transaction_pages:
+                    transactions = self.regex_parser.extract_with_regex(self.table_parser.transaction_pages)
+            else:
+                transactions = self.regex_parser.extract_with_regex(pages)
+        
+        # Оставляем только транзакции из запрошенного периода
+        if date_from or date_to:
+            in_period = []
+            for transaction in transactions:
+                date = transaction.get('date')
+                if not date:
+                    self.rejected_rows.append({
+                        "source": transaction.get('method'),
+                        "reason": "Отсутствует дата, нельзя проверить период",
+                        "description": transaction.get('description')
+                    })
+                elif (not date_from or date >= date_from) and (not date_to or date <= date_to):
+                    in_period.append(transaction)
+            transactions = in_period
         
         # Собираем отклоненные строки из TableParser и RegexParser
         self.rejected_rows.extend(self.table_parser.rejected_rows)
@@ -47,6 +78,7 @@ class BankStatementParser:
             "transactions": unique_transactions,
             "rejected_rows_count": len(self.rejected_rows),
             "rejected_rows": self.rejected_rows,
+            "stopped_at_page": self.table_parser.stopped_at_page,
             "extraction_timestamp": datetime.now().isoformat()
         }
         
@@ -1,20 +1,22 @@
 import re
-from typing import List, Dict
-from utils import parse_date, parse_amount, clean_description, classify_transaction
+from typing import List, Dict, Optional
+from utils import parse_date, parse_amount, clean_description
+from classifier import TransactionClassifier, get_classifier
 
 class RegexParser:
-    def __init__(self, pdf_file: str):
+    def __init__(self, pdf_file: str, classifier: Optional[TransactionClassifier] = None):
         self.pdf_file = pdf_file
+        self.classifier = classifier or get_classifier()
         self.full_text = ""
         self.rejected_rows = []  # Список для хранения отклоненных строк
 
-    def extract_with_regex(self) -> List[Dict]:
+    def extract_with_regex(self, pages: Optional[List[int]] = None) -> List[Dict]:
         """Извлечение через регулярные выражения"""
         try:
             transactions = []
             if not self.full_text:
                 from text_extractor import TextExtractor
-                self.full_text = TextExtractor(self.pdf_file).extract_full_text()
+                self.full_text = TextExtractor(self.pdf_file).extract_full_text(pages)
             
             patterns = [
                 r'(\d{2}\.\d{2}\.\d{4})\s+(\d{2}:\d{2})\s+(\d{2}\.\d{2}\.\d{4})\s+(\d{2}:\d{2})\s+([+-]?\d+[,.]?\d*)\s*₽?\s+([+-]?\d+[,.]?\d*)\s*₽?\s+(.+?)\s+(\d{4})',
@@ -23,6 +25,7 @@ class RegexParser:
             ]
             
             for pattern in patterns:
+                descriptions = []
                 matches = re.findall(pattern, self.full_text, re.MULTILINE | re.DOTALL)
                 print(f"Регулярка нашла {len(matches)} совпадений")
                 
@@ -45,13 +48,14 @@ class RegexParser:
                                 "date": parse_date(date),
                                 "amount": parse_amount(amount),
                                 "description": clean_description(description),
-                                "type": classify_transaction(description),
+                                "type": None,
                                 "card": card if 'card' in locals() else None,
                                 "method": "regex"
                             }
                             
                             if transaction["date"] and transaction["amount"] is not None:
                                 transactions.append(transaction)
+                                descriptions.append(description)
                             else:
                                 self.rejected_rows.append({
                                     "source": "regex",
@@ -67,6 +71,10 @@ class RegexParser:
                         })
                         continue
                 
+                # Классифицируем найденные транзакции одним пакетом
+                for transaction, category in zip(transactions, self.classifier.classify_batch(descriptions)):
+                    transaction["type"] = category
+                
                 if transactions:
                     print(f"Найдено {len(transactions)} транзакций через регулярки")
                     return transactions
@@ -0,0 +1,110 @@
+import gzip
+import json
+import math
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Ответы меньше этого размера не сжимаем
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+RESPONSE_FORMATS = ("full", "compact")
+
+
+def _replace_non_finite(value):
+    """Замена NaN и бесконечностей на None (как делает orjson)"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+
+def dumps(content) -> bytes:
+    """Сериализация в JSON (orjson, если установлен).
+
+    NaN и бесконечности в обоих случаях записываются как null.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    try:
+        return _json_dumps(content)
+    except ValueError:
+        # NaN встречается редко, поэтому копируем данные только в этом случае
+        return _json_dumps(_replace_non_finite(content))
+
+
+def _json_dumps(content) -> bytes:
+    """Сериализация стандартным json"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def to_columns(rows: List[Dict]) -> Dict[str, List]:
+    """Преобразование списка словарей в столбцы"""
+    columns = {}
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns[key] = None
+    return {key: [row.get(key) for row in rows] for key in columns}
+
+
+def to_compact(result: Dict) -> Dict:
+    """Компактный вид результата: транзакции хранятся по столбцам"""
+    compact = dict(result)
+    compact["transactions"] = to_columns(result.get("transactions", []))
+    return compact
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Разбор заголовка Accept-Encoding"""
+    encodings = {}
+    if not accept_encoding:
+        return encodings
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Сжатие тела ответа по заголовку Accept-Encoding"""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+
+    encodings = _accepted_encodings(accept_encoding)
+    # "*" означает любую кодировку, не перечисленную явно
+    wildcard = encodings.get("*", 0)
+    supported = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+    # Выбираем кодировку с наибольшим q, при равенстве - zstd
+    encoding = max(supported, key=lambda name: (encodings.get(name, wildcard), name == "zstd"))
+    if encodings.get(encoding, wildcard) <= 0:
+        return body, None
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body), "zstd"
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), "gzip"
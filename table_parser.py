@@ -2,51 +2,131 @@ import camelot
 import pdfplumber
 import pandas as pd
 import re
-from typing import List, Dict, Optional
-from utils import parse_date, parse_amount, clean_description, classify_transaction
+from typing import Iterator, List, Dict, Optional, Tuple
+from utils import parse_date, parse_amount, clean_description
+from classifier import TransactionClassifier, get_classifier
+
+# Признаки страницы с транзакциями
+TRANSACTION_INDICATORS = [
+    r'дата.*операции',
+    r'дата.*списания',
+    r'дата.*зачисления',
+    r'сумма.*операции',
+    r'описание.*операции',
+    r'получатель.*плательщик',
+    r'\d{2}\.\d{2}\.\d{4}.*\d{2}\.\d{2}\.\d{4}.*[+-]?\d+.*₽',
+    r'внутрибанковский.*перевод',
+    r'операция.*bitkoi',
+    r'перевод.*договор',
+    r'зачисление.*средств'
+]
+
+# Сколько страниц подряд без транзакций считаем концом таблицы
+TRAILING_PAGES_LIMIT = 2
+
+# Сколько страниц передаем в Camelot за один вызов
+PAGE_WINDOW_SIZE = 5
 
 class TableParser:
-    def __init__(self, pdf_file: str):
+    def __init__(self, pdf_file: str, classifier: Optional[TransactionClassifier] = None):
         self.pdf_file = pdf_file
+        self.classifier = classifier or get_classifier()
         self.rejected_rows = []  # Список для хранения отклоненных строк
+        self.page_count = 0
+        self.skipped_pages = []  # Страницы вне запрошенного периода
+        self.transaction_pages = []  # Страницы, переданные на извлечение
+        self.stopped_at_page = None  # Страница, после которой просмотр остановлен
+        self.camelot_configs = [
+            {"flavor": "stream", "row_tol": 15, "edge_tol": 500},
+            {"flavor": "lattice"},
+            {"flavor": "stream", "row_tol": 10, "edge_tol": 300},
+            {"flavor": "stream", "row_tol": 20, "edge_tol": 200},
+        ]
 
-    def find_transaction_pages(self) -> List[int]:
+    def find_transaction_pages(self, pages: Optional[List[int]] = None,
+                               date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[int]:
         """Поиск страниц с транзакциями"""
-        transaction_pages = []
+        return list(self.iter_transaction_pages(pages, date_from, date_to))
+
+    def iter_transaction_pages(self, pages: Optional[List[int]] = None,
+                               date_from: Optional[str] = None, date_to: Optional[str] = None) -> Iterator[int]:
+        """Последовательный поиск страниц с транзакциями.
+
+        Если pages не задан, страницы просматриваются по порядку; когда таблица
+        транзакций закончилась и следующие TRAILING_PAGES_LIMIT страниц подряд
+        не содержат признаков транзакций, остальные страницы не обрабатываются,
+        а номер последней просмотренной страницы сохраняется в stopped_at_page.
+        Явно заданные pages просматриваются все. Страницы, все даты которых
+        лежат вне периода date_from - date_to (ISO), пропускаются.
+        """
+        self.page_count = 0
+        self.skipped_pages = []
+        self.stopped_at_page = None
         try:
             with pdfplumber.open(self.pdf_file) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        transaction_indicators = [
-                            r'дата.*операции',
-                            r'дата.*списания',
-                            r'дата.*зачисления',
-                            r'сумма.*операции',
-                            r'описание.*операции',
-                            r'получатель.*плательщик',
-                            r'\d{2}\.\d{2}\.\d{4}.*\d{2}\.\d{2}\.\d{4}.*[+-]?\d+.*₽',
-                            r'внутрибанковский.*перевод',
-                            r'операция.*bitkoi',
-                            r'перевод.*договор',
-                            r'зачисление.*средств'
-                        ]
-                        if any(re.search(pattern, page_text, re.IGNORECASE) for pattern in transaction_indicators):
-                            transaction_pages.append(page_num)
+                self.page_count = len(pdf.pages)
+                pages_to_scan = sorted(set(pages)) if pages else range(1, self.page_count + 1)
+                found = False
+                trailing_pages = 0
+                for page_num in pages_to_scan:
+                    if page_num < 1 or page_num > self.page_count:
+                        continue
+                    page_text = pdf.pages[page_num - 1].extract_text()
+                    if page_text and any(re.search(pattern, page_text, re.IGNORECASE) for pattern in TRANSACTION_INDICATORS):
+                        found = True
+                        trailing_pages = 0
+                        if self._page_in_period(page_text, date_from, date_to):
+                            yield page_num
+                        else:
+                            self.skipped_pages.append(page_num)
+                            print(f"Страница {page_num} вне запрошенного периода, пропускаем")
+                    elif found and not pages:
+                        trailing_pages += 1
+                        if trailing_pages >= TRAILING_PAGES_LIMIT and page_num < self.page_count:
+                            self.stopped_at_page = page_num
+                            print(f"Таблица транзакций закончилась, страницы после {page_num} не обрабатываем")
+                            return
         except Exception as e:
             print(f"Ошибка при поиске страниц с транзакциями: {e}")
-        return transaction_pages
 
-    def extract_tables_universal(self) -> List[Dict]:
-        """Универсальное извлечение таблиц"""
+    def _page_in_period(self, page_text: str, date_from: Optional[str], date_to: Optional[str]) -> bool:
+        """Проверка, есть ли на странице даты из запрошенного периода"""
+        if not date_from and not date_to:
+            return True
+        dates = [parse_date(date) for date in re.findall(r'\d{2}\.\d{2}\.\d{4}', page_text)]
+        if not dates:
+            return True
+        if date_from and max(dates) < date_from:
+            return False
+        if date_to and min(dates) > date_to:
+            return False
+        return True
+
+    def extract_tables_universal(self, pages: Optional[List[int]] = None,
+                                 date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict]:
+        """Универсальное извлечение таблиц окнами страниц"""
         transactions = []
-        transaction_pages = self.find_transaction_pages()
+        self.transaction_pages = transaction_pages = []
+        window = []
+        
+        for page_num in self.iter_transaction_pages(pages, date_from, date_to):
+            transaction_pages.append(page_num)
+            window.append(page_num)
+            if len(window) >= PAGE_WINDOW_SIZE:
+                transactions.extend(self._extract_with_camelot(window))
+                window = []
+        if window:
+            transactions.extend(self._extract_with_camelot(window))
+        
+        if not transaction_pages and self.skipped_pages:
+            print("Все страницы с транзакциями вне запрошенного периода")
+            return []
         
         if not transaction_pages:
             print("Страницы с транзакциями не найдены, пробуем все страницы")
-            transaction_pages = list(range(1, 100))
+            transaction_pages = pages or list(range(1, (self.page_count or 99) + 1))
+            transactions.extend(self._extract_with_camelot(transaction_pages))
         
-        transactions.extend(self._extract_with_camelot(transaction_pages))
         if not transactions:
             transactions.extend(self._extract_with_pdfplumber(transaction_pages))
         
@@ -61,14 +141,7 @@ class TableParser:
             else:
                 pages_str = "all"
             
-            camelot_configs = [
-                {"flavor": "stream", "row_tol": 15, "edge_tol": 500},
-                {"flavor": "lattice"},
-                {"flavor": "stream", "row_tol": 10, "edge_tol": 300},
-                {"flavor": "stream", "row_tol": 20, "edge_tol": 200},
-            ]
-            
-            for config in camelot_configs:
+            for config in list(self.camelot_configs):
                 try:
                     tables = camelot.read_pdf(self.pdf_file, pages=pages_str, **config)
                     print(f"Camelot ({config['flavor']}): найдено {len(tables)} таблиц на страницах {pages_str}")
@@ -78,12 +151,14 @@ class TableParser:
                         header_row = self._find_header_row(df)
                         if header_row >= 0:
                             headers = [re.sub(r'\n|\s+', ' ', str(h).strip().lower()) for h in df.iloc[header_row].tolist()]
+                            table_transactions, descriptions = [], []
                             for idx in range(header_row + 1, len(df)):
                                 row = df.iloc[idx].tolist()
                                 if self._is_transaction_row(row):
-                                    transaction = self._parse_table_row(headers, row)
-                                    if transaction:
-                                        transactions.append(transaction)
+                                    parsed = self._parse_table_row(headers, row)
+                                    if parsed:
+                                        table_transactions.append(parsed[0])
+                                        descriptions.append(parsed[1])
                                     else:
                                         self.rejected_rows.append({
                                             "source": "camelot",
@@ -91,8 +166,13 @@ class TableParser:
                                             "reason": "Не удалось распарсить строку в транзакцию",
                                             "headers": headers
                                         })
+                            self._classify_transactions(table_transactions, descriptions)
+                            transactions.extend(table_transactions)
                     if transactions:
                         print(f"Найдено {len(transactions)} транзакций через Camelot")
+                        # Удачную конфигурацию пробуем первой для следующих окон
+                        self.camelot_configs.remove(config)
+                        self.camelot_configs.insert(0, config)
                         return transactions
                 except Exception as e:
                     print(f"Ошибка с конфигурацией {config}: {e}")
@@ -107,7 +187,7 @@ class TableParser:
         try:
             transactions = []
             with pdfplumber.open(self.pdf_file) as pdf:
-                pages_to_process = pages if pages else range(len(pdf.pages))
+                pages_to_process = pages if pages else range(1, len(pdf.pages) + 1)
                 for page_num in pages_to_process:
                     if page_num > len(pdf.pages):
                         break
@@ -128,23 +208,32 @@ class TableParser:
                             if header_row_idx >= 0:
                                 headers = table[header_row_idx]
                                 print(f"Заголовки на странице {page_num}: {headers}")
+                                table_transactions, descriptions = [], []
                                 for row in table[header_row_idx + 1:]:
                                     if row and any(cell for cell in row if cell):
-                                        transaction = self._parse_table_row(headers, row)
-                                        if transaction:
-                                            transactions.append(transaction)
+                                        parsed = self._parse_table_row(headers, row)
+                                        if parsed:
+                                            table_transactions.append(parsed[0])
+                                            descriptions.append(parsed[1])
                                         else:
                                             self.rejected_rows.append({
                                                 "source": "pdfplumber",
                                                 "page": page_num,
                                                 "reason": "Не удалось распарсить строку в транзакцию"
                                             })
+                                self._classify_transactions(table_transactions, descriptions)
+                                transactions.extend(table_transactions)
             print(f"Найдено {len(transactions)} транзакций через pdfplumber")
             return transactions
         except Exception as e:
             print(f"Ошибка pdfplumber: {e}")
             return []
 
+    def _classify_transactions(self, transactions: List[Dict], descriptions: List[str]):
+        """Классификация транзакций таблицы одним пакетом"""
+        for transaction, category in zip(transactions, self.classifier.classify_batch(descriptions)):
+            transaction["type"] = category
+
     def _find_header_row(self, df: pd.DataFrame) -> int:
         """Поиск строки с заголовками"""
         header_indicators = [
@@ -174,8 +263,8 @@ class TableParser:
                     amount_found = True
         return date_found and amount_found
 
-    def _parse_table_row(self, headers: List, row: List) -> Optional[Dict]:
-        """Парсинг строки таблицы"""
+    def _parse_table_row(self, headers: List, row: List) -> Optional[Tuple[Dict, str]]:
+        """Парсинг строки таблицы (транзакция и исходное описание для классификации)"""
         try:
             date_field = None
             amount_field = None
@@ -291,9 +380,9 @@ class TableParser:
                     "date": parse_date(date_field),
                     "amount": parse_amount(amount_field),
                     "description": clean_description(description_field),
-                    "type": classify_transaction(description_field),
+                    "type": None,
                     "method": "table"
-                }
+                }, description_field
             else:
                 reason = []
                 if not date_field:
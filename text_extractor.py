@@ -1,18 +1,19 @@
 import pdfplumber
 import re
-from typing import Dict
+from typing import Dict, List, Optional
 
 class TextExtractor:
     def __init__(self, pdf_file: str):
         self.pdf_file = pdf_file
         self.full_text = ""
 
-    def extract_full_text(self) -> str:
-        """Извлечение полного текста из PDF"""
+    def extract_full_text(self, pages: Optional[List[int]] = None) -> str:
+        """Извлечение полного текста из PDF (или только из страниц pages)"""
         try:
             with pdfplumber.open(self.pdf_file) as pdf:
                 full_text = ""
-                for page in pdf.pages:
+                pages_to_read = [pdf.pages[n - 1] for n in pages if 1 <= n <= len(pdf.pages)] if pages else pdf.pages
+                for page in pages_to_read:
                     page_text = page.extract_text()
                     if page_text:
                         full_text += page_text + "\n"
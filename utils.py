@@ -1,5 +1,7 @@
 import re
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+from classifier import get_classifier
 
 def parse_date(date_str: str) -> Optional[str]:
     """Парсинг даты"""
@@ -24,6 +26,38 @@ def parse_date(date_str: str) -> Optional[str]:
     
     return None
 
+# Максимальный номер страницы в параметре pages
+MAX_PAGE_NUMBER = 1000
+
+def parse_period_date(date_str: str) -> Optional[str]:
+    """Строгий парсинг даты периода (YYYY-MM-DD или DD.MM.YYYY) в ISO"""
+    for date_format in ('%Y-%m-%d', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(str(date_str).strip(), date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
+
+def parse_page_range(pages_str: str) -> Optional[List[int]]:
+    """Парсинг списка страниц вида 1,3,5-7"""
+    if not pages_str:
+        return None
+
+    pages = set()
+    for part in str(pages_str).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition('-')
+        if sep and not end.strip():
+            raise ValueError(f"Не указан конец диапазона страниц: {part}")
+        start, end = int(start), int(end) if sep else int(start)
+        if start < 1 or end < start or end > MAX_PAGE_NUMBER:
+            raise ValueError(f"Некорректный диапазон страниц: {part}")
+        pages.update(range(start, end + 1))
+
+    return sorted(pages) or None
+
 def parse_amount(amount_str: str) -> Optional[float]:
     """Парсинг суммы"""
     if not amount_str:
@@ -60,20 +94,4 @@ def clean_description(description: str) -> str:
 
 def classify_transaction(description: str) -> str:
     """Классификация транзакции"""
-    if not description:
-        return "unknown"
-    
-    desc_lower = description.lower()
-    
-    if any(word in desc_lower for word in ['входящий', 'поступление', 'зачисление', 'перевод на счет']):
-        return "income"
-    elif any(word in desc_lower for word in ['платеж', 'оплата', 'списание', 'покупка']):
-        return "payment"
-    elif any(word in desc_lower for word in ['перевод', 'перечисление', 'внутрибанковский']):
-        return "transfer"
-    elif any(word in desc_lower for word in ['снятие', 'выдача', 'банкомат']):
-        return "withdrawal"
-    elif any(word in desc_lower for word in ['комиссия', 'плата за']):
-        return "fee"
-    else:
-        return "other"
\ No newline at end of file
+    return get_classifier().classify(description)